@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import pickle
+import time
+
+import lambda_encoding
+
+
+def _records(count: int) -> list:
+    return [{
+        "keys": {"email_officer": f"teste.{i}@mailer.com.br"},
+        "values": {
+            "email_to": f"teste.{i}@mailer.com.br",
+            "email_cc": "teste.02@mailer.com.br",
+            "noma_officer": "Fulano",
+            "subjetc": "Teste",
+            "introducao": "Informo que, na data " * 8
+        }
+    } for i in range(count)]
+
+
+def _measure(encode, payload, repeat: int) -> float:
+    encode(payload)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode(payload)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da codificação de corpos em pool de processos")
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--file-mb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="quantidades de workers a medir (padrão: 1, 2, 4, 8 até o número de CPUs)")
+    args = parser.parse_args()
+
+    lambda_encoding.ENCODING_COMPRESS = args.compress
+    cases = (
+        ("lista de registros", lambda_encoding.encode_records, _records(args.records)),
+        ("arquivo (base64)", lambda_encoding.encode_content,
+         {"name": "arquivo.bin", "file": os.urandom(args.file_mb * 1024 * 1024)}),
+    )
+    workers = args.workers or [count for count in sorted({1, 2, 4, 8, os.cpu_count() or 1})
+                               if count <= (os.cpu_count() or 1)]
+
+    for name, encode, payload in cases:
+        baseline = None
+        print(f"{name} (compactação={'gzip' if args.compress else 'não'})")
+        if encode is lambda_encoding.encode_records:
+            # O pickle dos registros roda na thread principal e limita o ganho do pool
+            serialize = _measure(lambda records: pickle.dumps(records, pickle.HIGHEST_PROTOCOL), payload, args.repeat)
+            dumps = _measure(json.dumps, payload, args.repeat)
+            print(f"  pickle para os workers {serialize * 1000:9.1f} ms  (json.dumps inline {dumps * 1000:.1f} ms)")
+        elif not args.compress:
+            print("  sem --compress o base64 roda sempre inline; os tempos não dependem dos workers")
+        for count in workers:
+            lambda_encoding.shutdown_executor()
+            lambda_encoding.ENCODING_POOL_WORKERS = count
+            elapsed = _measure(encode, payload, args.repeat)
+            baseline = baseline or elapsed
+            print(f"  {count:>2} workers  {elapsed * 1000:9.1f} ms  speedup {baseline / elapsed:4.2f}x")
+    lambda_encoding.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
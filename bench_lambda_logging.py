@@ -0,0 +1,56 @@
+import argparse
+import logging
+import os
+import threading
+import time
+
+import lambda_logging
+
+
+def _storm(logger: logging.Logger, errors: int, threads: int) -> float:
+    error = ConnectionError("Max retries exceeded with url: / (Caused by NewConnectionError)")
+
+    def worker():
+        for _ in range(errors // threads):
+            logger.error("Erro Conexão: %s", error, extra={"operation": "_send_object", "status_code": None})
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def _sync_logger(stream) -> logging.Logger:
+    logger = logging.getLogger("bench.sync")
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(lambda_logging.LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de logging durante uma tempestade de erros")
+    parser.add_argument("--errors", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        sync_elapsed = _storm(_sync_logger(devnull), args.errors, args.threads)
+
+        lambda_logging.StderrHandler.stream = devnull
+        async_logger = lambda_logging.get_logger("bench.async")
+        lambda_logging.enable_async_logging()
+        async_elapsed = _storm(async_logger, args.errors, args.threads)
+        lambda_logging.shutdown_logging()
+
+    for name, elapsed in (("síncrono (StreamHandler)", sync_elapsed), ("fila + amostragem", async_elapsed)):
+        print(f"{name:<26} {elapsed * 1000:9.1f} ms  {elapsed / args.errors * 1_000_000:7.2f} µs/erro")
+    print(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import lambda_function
+import lambda_http
+import server
+
+TOKEN_RESPONSE = json.dumps({"access_token": "eyJhbGciOiJIUzI1", "token_type": "Bearer", "expires_in": 3600}).encode()
+
+
+class FakeBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.latency)
+        body = TOKEN_RESPONSE if self.path == "/token" else b""
+        self.send_response(200 if self.path == "/token" else 202)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start(http_server) -> threading.Thread:
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def _throughput(call, requests_total: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: call(), range(requests_total)))
+    elapsed = time.perf_counter() - start
+    failures = sum(1 for status in results if status >= 400)
+    if failures:
+        print(f"  aviso: {failures} chamadas com erro")
+    return requests_total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput do modo servidor x invocação por chamada")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--backend-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    FakeBackendHandler.latency = args.backend_latency_ms / 1000
+    backend = ThreadingHTTPServer(("127.0.0.1", 0), FakeBackendHandler)
+    backend.daemon_threads = True
+    _start(backend)
+
+    lambda_function.BASE_URL = f"http://127.0.0.1:{backend.server_port}"
+    lambda_function.CLIENT_ID = lambda_function.SECRET_ID = lambda_function.ACCOUNT_ID = "bench"
+    event = [{"keys": {"email_officer": "teste.01@mailer.com.br"}, "values": {"noma_officer": "Fulano"}}]
+
+    # Estilo Lambda: token novo e conexão nova a cada invocação
+    lambda_function.SESSION = requests
+    lambda_http.HEDGER.session = requests
+    lambda_http.TOKEN_CACHE.enabled = False
+    per_call = _throughput(lambda: lambda_function.lambda_function(event, None)["statusCode"],
+                           args.requests, args.concurrency)
+
+    lambda_function.SESSION = lambda_http.SESSION
+    lambda_http.HEDGER.session = lambda_http.SESSION
+    lambda_http.TOKEN_CACHE.enabled = True
+    state = server.ServerState()
+    http_server = server.PooledWSGIServer("127.0.0.1", 0, server.create_app(state), args.concurrency)
+    _start(http_server)
+
+    local = threading.local()
+
+    def call_server():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session.post(f"http://127.0.0.1:{http_server.port}/objects", json=event).status_code
+
+    pooled = _throughput(call_server, args.requests, args.concurrency)
+    http_server.shutdown()
+    backend.shutdown()
+
+    print(f"invocação por chamada  {per_call:8.1f} req/s")
+    print(f"modo servidor          {pooled:8.1f} req/s  ({pooled / per_call:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
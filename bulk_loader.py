@@ -0,0 +1,297 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
+import lambda_function
+from lambda_http import TOKEN_CACHE
+from lambda_logging import get_logger
+
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", "500"))
+BULK_CONCURRENCY = int(os.environ.get("BULK_CONCURRENCY", "4"))
+BULK_PROGRESS_INTERVAL = 1.0
+BULK_CHECKPOINT_INTERVAL = 1.0
+BULK_IDENTITY_BYTES = 64 * 1024
+BULK_RETRIES = int(os.environ.get("BULK_RETRIES", "4"))
+BULK_RETRY_BACKOFF = float(os.environ.get("BULK_RETRY_BACKOFF", "0.5"))
+TRANSIENT_STATUS_CODES = (408, 429)
+
+logger = get_logger(__name__)
+
+
+def iter_file_lines(path: str, offset: int = 0) -> Iterator[tuple]:
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if offset >= size:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            position = offset
+            while position < size:
+                end = mapped.find(b"\n", position)
+                if end == -1:
+                    end = size
+                line = mapped[position:end]
+                position = min(end + 1, size)
+                yield position, line
+
+
+def iter_stream_lines(stream, offset: int = 0) -> Iterator[tuple]:
+    # Stdin não permite seek: os bytes já processados são lidos e descartados
+    position = 0
+    for line in stream:
+        position += len(line)
+        if position <= offset:
+            continue
+        yield position, line.rstrip(b"\r\n")
+
+
+def file_identity(path: str) -> dict:
+    # Identifica o arquivo para que um checkpoint não seja aplicado a outra entrada
+    stat = os.stat(path)
+    with open(path, "rb") as file:
+        head = file.read(BULK_IDENTITY_BYTES)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtimeNs": stat.st_mtime_ns,
+            "headSha256": hashlib.sha256(head).hexdigest()}
+
+
+def stream_identity(stream) -> tuple:
+    # Stdin não tem tamanho nem data: as primeiras linhas são lidas para o hash e
+    # devolvidas junto com o restante do stream
+    head = []
+    size = 0
+    while size < BULK_IDENTITY_BYTES:
+        line = stream.readline()
+        if not line:
+            break
+        head.append(line)
+        size += len(line)
+    identity = {"path": "-", "headSha256": hashlib.sha256(b"".join(head)).hexdigest()}
+    return identity, itertools.chain(head, stream)
+
+
+class BulkLoader:
+    def __init__(self, batch_size: int = BULK_BATCH_SIZE, concurrency: int = BULK_CONCURRENCY,
+                 checkpoint_path: Optional[str] = None, errors_path: Optional[str] = None,
+                 total_bytes: int = 0, progress_stream=None, input_identity: Optional[dict] = None):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+        self.errors_path = errors_path
+        self.total_bytes = total_bytes
+        self.progress_stream = progress_stream or sys.stderr
+        self.input_identity = input_identity
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(concurrency * 2)
+        self._pending = deque()
+        self._done = set()
+        self._last_checkpoint_write = 0.0
+        self._finished = threading.Event()
+        self._stalled = threading.Event()
+
+        self.offset = 0
+        self.sent = 0
+        self.failed = 0
+        self.invalid = 0
+        self.started_at = time.monotonic()
+
+    def read_checkpoint(self) -> int:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, encoding="utf-8") as checkpoint:
+            data = json.load(checkpoint)
+        if self.input_identity is not None and data.get("input") != self.input_identity:
+            raise ValueError(f"O checkpoint {self.checkpoint_path} pertence a outra entrada; "
+                             "use --restart ou outro --checkpoint")
+        return int(data.get("offset", 0))
+
+    def _write_checkpoint(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not self.checkpoint_path or (not force and now - self._last_checkpoint_write < BULK_CHECKPOINT_INTERVAL):
+            return
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as checkpoint:
+            json.dump({"offset": self.offset, "sent": self.sent, "failed": self.failed,
+                       "input": self.input_identity}, checkpoint)
+        os.replace(temporary, self.checkpoint_path)
+        self._last_checkpoint_write = now
+
+    def _batches(self, lines: Iterator[tuple]) -> Iterator[tuple]:
+        batch = []
+        end_offset = yielded_offset = 0
+        for end_offset, line in lines:
+            if not line.strip():
+                continue
+            try:
+                batch.append(json.loads(line))
+            except json.JSONDecodeError:
+                with self._lock:
+                    self.invalid += 1
+                self._reject([line.decode("utf-8", errors="replace")], "linha JSON inválida")
+                continue
+            if len(batch) >= self.batch_size:
+                yield end_offset, batch
+                batch, yielded_offset = [], end_offset
+        if batch or end_offset > yielded_offset:
+            # Um lote vazio no final garante que o checkpoint cubra linhas em branco ou inválidas
+            yield end_offset, batch
+
+    def _send(self, batch: list) -> dict:
+        token = TOKEN_CACHE.get(
+            (lambda_function.CLIENT_ID, lambda_function.ACCOUNT_ID),
+            lambda: lambda_function._get_token(lambda_function.CLIENT_ID, lambda_function.SECRET_ID,
+                                               lambda_function.ACCOUNT_ID))
+        if not token or "access_token" not in token:
+            return token or {"statusCode": 401, "message": "O token não pode ser nulo ou vazio"}
+        return lambda_function._send_object(batch, token["access_token"])
+
+    def _send_with_retry(self, batch: list) -> dict:
+        for attempt in range(BULK_RETRIES + 1):
+            try:
+                result = self._send(batch) or {"statusCode": None, "message": "sem resposta"}
+            except Exception as err:
+                result = {"statusCode": None, "message": str(err)}
+            if not _is_transient(result) or attempt == BULK_RETRIES or self._stalled.is_set():
+                return result
+            # Backoff exponencial: uma queda do /token ou do backend não deve descartar o lote
+            time.sleep(BULK_RETRY_BACKOFF * 2 ** attempt)
+        return result
+
+    def _process(self, end_offset: int, batch: list) -> None:
+        result = self._send_with_retry(batch) if batch else {"statusCode": 200}
+        transient = _is_transient(result)
+        failed = transient or (result.get("statusCode") or 500) >= 400
+        if failed and not transient:
+            self._reject([json.dumps(record, ensure_ascii=False) for record in batch],
+                         result.get("message", "sem resposta"))
+        elif transient:
+            logger.error("Lote não enviado após %s tentativas: %s", BULK_RETRIES + 1, result.get("message"),
+                         extra={"operation": "bulk_loader", "status_code": result.get("statusCode")})
+            # Falha transitória: o checkpoint para antes deste lote e a leitura é interrompida
+            self._stalled.set()
+
+        with self._lock:
+            if failed:
+                self.failed += len(batch)
+            else:
+                self.sent += len(batch)
+            if not transient:
+                self._done.add(end_offset)
+            # O checkpoint só avança até o último lote contíguo concluído
+            while self._pending and self._pending[0] in self._done:
+                self.offset = self._pending.popleft()
+                self._done.discard(self.offset)
+            self._write_checkpoint()
+
+    def _reject(self, lines: list, reason: str) -> None:
+        logger.error("Lote rejeitado no carregamento em massa: %s", reason, extra={"operation": "bulk_loader"})
+        if not self.errors_path or not lines:
+            return
+        # Só os registros, em NDJSON, para que o arquivo possa ser reenviado pelo próprio loader
+        with self._lock, open(self.errors_path, "a", encoding="utf-8") as errors:
+            errors.writelines(f"{line}\n" for line in lines)
+
+    def _report_progress(self) -> None:
+        while not self._finished.wait(BULK_PROGRESS_INTERVAL):
+            self.progress_stream.write(self.progress() + "\n")
+            self.progress_stream.flush()
+
+    def progress(self) -> str:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            line = (f"{self.sent} enviados, {self.failed} com erro, {self.invalid} inválidos, "
+                    f"{self.sent / elapsed:.1f} registros/s, offset {self.offset}")
+            if self.total_bytes:
+                line += f" ({self.offset / self.total_bytes:.1%})"
+            return line
+
+    def run(self, lines: Iterator[tuple]) -> bool:
+        self.started_at = time.monotonic()
+        reporter = threading.Thread(target=self._report_progress, daemon=True)
+        reporter.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-loader") as executor:
+                for end_offset, batch in self._batches(lines):
+                    # Backpressure: a leitura para enquanto houver lotes demais em voo
+                    self._slots.acquire()
+                    if self._stalled.is_set():
+                        self._slots.release()
+                        break
+                    with self._lock:
+                        self._pending.append(end_offset)
+                    future = executor.submit(self._process, end_offset, batch)
+                    future.add_done_callback(lambda _: self._slots.release())
+        finally:
+            self._finished.set()
+            reporter.join()
+            with self._lock:
+                self._write_checkpoint(force=True)
+            self.progress_stream.write(self.progress() + "\n")
+            if self._stalled.is_set():
+                self.progress_stream.write(f"Interrompido por falha transitória; execute novamente para retomar "
+                                           f"do offset {self.offset}\n")
+        return not (self.failed or self.invalid or self._stalled.is_set())
+
+
+def _is_transient(result: Optional[dict]) -> bool:
+    status_code = (result or {}).get("statusCode")
+    return status_code is None or status_code >= 500 or status_code in TRANSIENT_STATUS_CODES
+
+
+def main(argv=None, progress_stream=None) -> int:
+    parser = argparse.ArgumentParser(description="Carrega registros NDJSON em massa pelo handler de criação")
+    parser.add_argument("input", help="arquivo NDJSON/JSONL ou '-' para stdin")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=BULK_CONCURRENCY)
+    parser.add_argument("--checkpoint", help="arquivo de checkpoint (padrão: <input>.checkpoint; obrigatório para stdin)")
+    parser.add_argument("--errors", help="NDJSON com os registros rejeitados, pronto para reenvio (padrão: <input>.errors.ndjson)")
+    parser.add_argument("--restart", action="store_true", help="ignora o checkpoint existente")
+    args = parser.parse_args(argv)
+
+    from_stdin = args.input == "-"
+    if from_stdin and not args.checkpoint:
+        parser.error("--checkpoint é obrigatório ao ler de stdin")
+
+    default_prefix = "stdin" if from_stdin else args.input
+    if from_stdin:
+        identity, stream = stream_identity(sys.stdin.buffer)
+    else:
+        identity = file_identity(args.input)
+    loader = BulkLoader(
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint or f"{default_prefix}.checkpoint",
+        errors_path=args.errors or f"{default_prefix}.errors.ndjson",
+        total_bytes=0 if from_stdin else identity["size"],
+        progress_stream=progress_stream,
+        input_identity=identity,
+    )
+    try:
+        offset = 0 if args.restart else loader.read_checkpoint()
+    except ValueError as err:
+        parser.error(str(err))
+    loader.offset = offset
+    if offset:
+        loader.progress_stream.write(f"Retomando a partir do offset {offset}\n")
+
+    TOKEN_CACHE.enabled = True
+    if from_stdin:
+        lines = iter_stream_lines(stream, offset)
+    else:
+        lines = iter_file_lines(args.input, offset)
+    return 0 if loader.run(lines) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+import atexit
+import base64
+import gzip
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from lambda_logging import get_logger
+
+ENCODING_POOL_ENABLED = os.environ.get("LAMBDA_ENCODING_POOL", "").lower() in ("1", "true", "yes")
+ENCODING_POOL_WORKERS = int(os.environ.get("LAMBDA_ENCODING_POOL_WORKERS", "0")) or os.cpu_count() or 1
+ENCODING_POOL_MIN_RECORDS = int(os.environ.get("LAMBDA_ENCODING_POOL_MIN_RECORDS", "2000"))
+ENCODING_POOL_MIN_BYTES = int(os.environ.get("LAMBDA_ENCODING_POOL_MIN_BYTES", str(4 * 1024 * 1024)))
+ENCODING_COMPRESS = os.environ.get("LAMBDA_ENCODING_COMPRESS", "").lower() in ("1", "true", "yes")
+ENCODING_COMPRESS_LEVEL = 6
+CHUNKS_PER_WORKER = 4
+
+logger = get_logger(__name__)
+
+_executor_lock = threading.Lock()
+_executor = None
+_executor_unavailable = False
+
+
+def _get_executor():
+    global _executor, _executor_unavailable
+    with _executor_lock:
+        if _executor is None and not _executor_unavailable and ENCODING_POOL_WORKERS > 1:
+            try:
+                _executor = ProcessPoolExecutor(max_workers=ENCODING_POOL_WORKERS, mp_context=_pool_context())
+            except (OSError, NotImplementedError) as err:
+                # O runtime do Lambda não tem /dev/shm; nesse caso tudo roda inline
+                logger.warning("Pool de processos indisponível, codificação inline: %s", err)
+                _executor_unavailable = True
+        return _executor
+
+
+def _pool_context():
+    # fork a partir de um processo com threads (listener de log, servidor) pode
+    # herdar locks travados; forkserver/spawn sobem workers limpos
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def _reset_after_fork() -> None:
+    global _executor, _executor_lock
+    # O pool pertence ao processo pai; o filho cria o seu sob demanda
+    _executor_lock = threading.Lock()
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(shutdown_executor)
+
+
+def _compress(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=ENCODING_COMPRESS_LEVEL, mtime=0)
+
+
+def _encode_records_chunk(records: list, prefix: bytes, suffix: bytes, compress: bool) -> bytes:
+    data = prefix + json.dumps(records, ensure_ascii=False)[1:-1].encode("utf-8") + suffix
+    return _compress(data) if compress else data
+
+
+def _encode_bytes_chunk(data: bytes, prefix: bytes, suffix: bytes, compress: bool) -> bytes:
+    data = prefix + base64.b64encode(data) + suffix
+    return _compress(data) if compress else data
+
+
+def _compress_chunk(data: bytes, prefix: bytes, suffix: bytes, compress: bool) -> bytes:
+    return _compress(prefix + data + suffix)
+
+
+def _encoding_headers(compress: bool) -> dict:
+    return {"Content-Encoding": "gzip"} if compress else {}
+
+
+def _run_chunks(worker, chunks: list, prefix: bytes, suffix: bytes, separator: bytes, compress: bool) -> bytes:
+    # Cada parte compactada é um membro gzip completo; a concatenação de membros
+    # é um arquivo gzip válido (RFC 1952), então o corpo final é só o join
+    prefixes = [prefix] + [separator] * (len(chunks) - 1)
+    suffixes = [b""] * (len(chunks) - 1) + [suffix]
+    executor = _get_executor() if len(chunks) > 1 else None
+    if executor is not None:
+        try:
+            return b"".join(executor.map(worker, chunks, prefixes, suffixes, [compress] * len(chunks)))
+        except BrokenProcessPool as err:
+            # Um worker morreu (ex.: OOM); o pool quebrado é descartado e recriado na próxima chamada
+            logger.warning("Pool de processos quebrado, codificação inline: %s", err)
+            _discard_executor(executor)
+    return b"".join(map(worker, chunks, prefixes, suffixes, [compress] * len(chunks)))
+
+
+def _split(items, parts: int) -> list:
+    size = -(-len(items) // parts)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def encode_records(records: list) -> tuple:
+    compress = ENCODING_COMPRESS
+    if len(records) < ENCODING_POOL_MIN_RECORDS:
+        chunks = [records]
+    else:
+        chunks = _split(records, ENCODING_POOL_WORKERS * CHUNKS_PER_WORKER)
+    body = _run_chunks(_encode_records_chunk, chunks, b"[", b"]", b",", compress)
+    return body, _encoding_headers(compress)
+
+
+def encode_content(content: dict) -> tuple:
+    compress = ENCODING_COMPRESS
+    file_data = content.get("file")
+    if isinstance(file_data, (bytes, bytearray)):
+        # O arquivo é codificado em base64 em blocos múltiplos de 3 bytes para
+        # que a concatenação seja idêntica ao base64 do arquivo inteiro
+        head, tail = _split_around_file(content)
+        chunk_size = -(-len(file_data) // (ENCODING_POOL_WORKERS * CHUNKS_PER_WORKER * 3)) * 3
+        if not compress or len(file_data) < ENCODING_POOL_MIN_BYTES:
+            # Sem gzip o b64encode em C custa menos que copiar os blocos para os workers e de volta
+            chunks = [file_data]
+        else:
+            chunks = [bytes(file_data[i:i + chunk_size]) for i in range(0, len(file_data), chunk_size)]
+        body = _run_chunks(_encode_bytes_chunk, chunks, head, tail, b"", compress)
+        return body, _encoding_headers(compress)
+
+    data = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    if not compress:
+        return data, {}
+    if len(data) < ENCODING_POOL_MIN_BYTES:
+        return _compress(data), _encoding_headers(compress)
+    chunk_size = -(-len(data) // (ENCODING_POOL_WORKERS * CHUNKS_PER_WORKER))
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    return _run_chunks(_compress_chunk, chunks, b"", b"", b"", compress), _encoding_headers(compress)
+
+
+def _split_around_file(content: dict) -> tuple:
+    marker = "\x00file\x00"
+    template = json.dumps({**content, "file": marker}, ensure_ascii=False)
+    head, tail = template.split(json.dumps(marker), 1)
+    return f'{head}"'.encode("utf-8"), f'"{tail}'.encode("utf-8")
+
+
+def _encode_json(obj: Any) -> tuple:
+    # Listas e dicionários sempre vão como JSON; passados direto ao requests
+    # virariam um corpo form-urlencoded só com as chaves
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8"), {}
+
+
+def prepare_object_body(request_obj: Any) -> tuple:
+    if isinstance(request_obj, str):
+        return request_obj, {}
+    if not ENCODING_POOL_ENABLED:
+        return _encode_json(request_obj)
+    if isinstance(request_obj, list):
+        return encode_records(request_obj)
+    return encode_content(request_obj)
+
+
+def prepare_content_body(content: dict) -> tuple:
+    if not ENCODING_POOL_ENABLED:
+        return _encode_json(content)
+    return encode_content(content)
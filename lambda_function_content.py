@@ -1,15 +1,21 @@
 import json
-import logging
 from functools import wraps
 from typing import Optional
 
 import requests
 
+from lambda_encoding import prepare_content_body
+from lambda_http import HEDGER, SESSION, TOKEN_CACHE
+from lambda_logging import get_logger
+from lambda_profiler import profile_invocation
+
 BASE_URL = "http://localhost:8080"
 CLIENT_ID = ""
 SECRET_ID = ""
 ACCOUNT_ID = ""
 
+logger = get_logger(__name__)
+
 def _handle_http_errors(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -17,23 +23,27 @@ def _handle_http_errors(func):
             return func(*args, **kwargs)
         except requests.exceptions.HTTPError as errh:
             exp_code = errh.response.status_code
-            logging.error(f"Erro Http code {exp_code} : {str(errh)}")
+            logger.error("Erro Http code %s : %s", exp_code, errh, extra=_log_fields(func, errh))
             return _build_response(errh.response.status_code, "Erro http")
 
         except requests.exceptions.ConnectionError as errc:
-            logging.error(f"Erro Conexão: {str(errc)}")
+            logger.error("Erro Conexão: %s", errc, extra=_log_fields(func, errc))
             return _build_response(errc.response.status_code, "Erro Conexão")
 
         except requests.exceptions.Timeout as errt:
-            logging.error(f"Erro Timeout: {str(errt)}")
+            logger.error("Erro Timeout: %s", errt, extra=_log_fields(func, errt))
             return _build_response(errt.response.status_code, "Erro Timeout")
 
         except requests.exceptions.RequestException as err:
-            logging.error(f"Erro Inesperado: {str(err)}")
+            logger.error("Erro Inesperado: %s", err, extra=_log_fields(func, err))
             return _build_response(err.response.status_code, "Erro inesperado")
     return wrapper
 
 
+def _log_fields(func, error: requests.exceptions.RequestException) -> dict:
+    return {"operation": func.__name__, "status_code": getattr(error.response, "status_code", None)}
+
+
 def _build_response(status_code: int, body_message: str) -> dict:
     return {
         "statusCode": status_code,
@@ -59,7 +69,8 @@ def _get_token(client_id: str, client_secret: str, account_id: str) -> dict:
         "account_id": account_id
     }
 
-    response = requests.post(f"{BASE_URL}/token", body, headers={"Content-Type": "application/json"})
+    response = HEDGER.request("POST", f"{BASE_URL}/token", "token", data=body,
+                              headers={"Content-Type": "application/json"})
     response.raise_for_status()
     return response.json()
 
@@ -68,13 +79,14 @@ def _get_token(client_id: str, client_secret: str, account_id: str) -> dict:
 @_handle_http_errors
 def _send_content(content: str | dict, token: str) -> dict:
     try:
-        request_body = _validate_content(content)
+        request_body, encoding_header = prepare_content_body(_validate_content(content))
 
         request_header = {
             "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            **encoding_header
         }
-        response = requests.post(f"{BASE_URL}", request_body, headers=request_header)
+        response = SESSION.post(f"{BASE_URL}", request_body, headers=request_header)
         response.raise_for_status()
         # todo: Enviar o id do objeto para o SQS
 
@@ -110,9 +122,10 @@ def _validate_content(content: str | dict) -> Optional[dict]:
     return content_dict
 
 
+@profile_invocation
 def lambda_function(event, context):
     try:
-        token = _get_token(CLIENT_ID, SECRET_ID, ACCOUNT_ID)
+        token = TOKEN_CACHE.get((CLIENT_ID, ACCOUNT_ID), lambda: _get_token(CLIENT_ID, SECRET_ID, ACCOUNT_ID))
         if not token:
             raise ValueError("O token não pode ser nulo ou vazio")
 
@@ -123,11 +136,11 @@ def lambda_function(event, context):
         return send_result
 
     except ValueError as errv:
-        logging.error(f"Erro de validação: {errv}")
+        logger.error("Erro de validação: %s", errv, extra={"operation": "lambda_function"})
         return _build_response(400, str(errv))
 
     except Exception as err:
-        logging.error(f"Erro ao tentar realizar a requisição: {str(err)}")
+        logger.error("Erro ao tentar realizar a requisição: %s", err, extra={"operation": "lambda_function"})
         return _build_response(500, "Ocorreu um erro genérico na requisição")
 
 
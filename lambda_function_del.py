@@ -1,13 +1,19 @@
-import logging
 from functools import wraps
 
 import requests
 
+from lambda_http import HEDGER, TOKEN_CACHE
+from lambda_logging import get_logger
+from lambda_profiler import profile_invocation
+from record_cache import RECORD_CACHE
+
 BASE_URL = "http://localhost:8080"
 CLIENT_ID = ""
 SECRET_ID = ""
 ACCOUNT_ID = ""
 
+logger = get_logger(__name__)
+
 def _handle_http_errors(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -15,23 +21,27 @@ def _handle_http_errors(func):
             return func(*args, **kwargs)
         except requests.exceptions.HTTPError as errh:
             exp_code = errh.response.status_code
-            logging.error(f"Erro Http code {exp_code} : {str(errh)}")
+            logger.error("Erro Http code %s : %s", exp_code, errh, extra=_log_fields(func, errh))
             return _build_response(errh.response.status_code, "Erro http")
 
         except requests.exceptions.ConnectionError as errc:
-            logging.error(f"Erro Conexão: {str(errc)}")
+            logger.error("Erro Conexão: %s", errc, extra=_log_fields(func, errc))
             return _build_response(errc.response.status_code, "Erro Conexão")
 
         except requests.exceptions.Timeout as errt:
-            logging.error(f"Erro Timeout: {str(errt)}")
+            logger.error("Erro Timeout: %s", errt, extra=_log_fields(func, errt))
             return _build_response(errt.response.status_code, "Erro Timeout")
 
         except requests.exceptions.RequestException as err:
-            logging.error(f"Erro Inesperado: {str(err)}")
+            logger.error("Erro Inesperado: %s", err, extra=_log_fields(func, err))
             return _build_response(err.response.status_code, "Erro inesperado")
     return wrapper
 
 
+def _log_fields(func, error: requests.exceptions.RequestException) -> dict:
+    return {"operation": func.__name__, "status_code": getattr(error.response, "status_code", None)}
+
+
 def _build_response(status_code: int, body_message: str) -> dict:
     return {
         "statusCode": status_code,
@@ -57,7 +67,8 @@ def _get_token(client_id: str, client_secret: str, account_id: str) -> dict:
         "account_id": account_id
     }
 
-    response = requests.post(f"{BASE_URL}/token", body, headers={"Content-Type": "application/json"})
+    response = HEDGER.request("POST", f"{BASE_URL}/token", "token", data=body,
+                              headers={"Content-Type": "application/json"})
     response.raise_for_status()
     return response.json()
 
@@ -79,15 +90,17 @@ def _delete_object(resource: dict, token: str) -> dict:
         "Content-Type": "application/json"
     }
     resource_id = resource.get("id")
-    response = requests.delete(f"{BASE_URL}/{resource_id}", headers=request_header)
+    response = HEDGER.request("DELETE", f"{BASE_URL}/{resource_id}", "delete", headers=request_header)
     response.raise_for_status()
+    RECORD_CACHE.invalidate(resource_id)
     return _build_response(200, f"Registro {resource_id} excluído com sucesso")
 
 
 
+@profile_invocation
 def lambda_function(event, context):
     try:
-        token = _get_token(CLIENT_ID, SECRET_ID, ACCOUNT_ID)
+        token = TOKEN_CACHE.get((CLIENT_ID, ACCOUNT_ID), lambda: _get_token(CLIENT_ID, SECRET_ID, ACCOUNT_ID))
         if not token:
             raise ValueError("O token não pode ser nulo ou vazio")
 
@@ -95,14 +108,17 @@ def lambda_function(event, context):
         if not delete_result:
             raise ValueError("Houve um problema no envio da requisição")
 
+        if HEDGER.enabled:
+            delete_result["hedging"] = HEDGER.stats()
+
         return delete_result
 
     except ValueError as errv:
-        logging.error(f"Erro de validação: {errv}")
+        logger.error("Erro de validação: %s", errv, extra={"operation": "lambda_function"})
         return _build_response(400, str(errv))
 
     except Exception as err:
-        logging.error(f"Erro ao tentar realizar a requisição: {str(err)}")
+        logger.error("Erro ao tentar realizar a requisição: %s", err, extra={"operation": "lambda_function"})
         return _build_response(500, "Ocorreu um erro genérico na requisição")
 
 
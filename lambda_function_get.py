@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+import requests
+
+from lambda_http import HEDGER, SESSION, TOKEN_CACHE
+from lambda_logging import get_logger
+from lambda_profiler import profile_invocation
+from record_cache import RECORD_CACHE
+
+BASE_URL = "http://localhost:8080"
+CLIENT_ID = ""
+SECRET_ID = ""
+ACCOUNT_ID = ""
+GET_BULK_WORKERS = int(os.environ.get("LAMBDA_GET_BULK_WORKERS", "8"))
+
+logger = get_logger(__name__)
+
+def _handle_http_errors(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except requests.exceptions.HTTPError as errh:
+            exp_code = errh.response.status_code
+            logger.error("Erro Http code %s : %s", exp_code, errh, extra=_log_fields(func, errh))
+            return _build_response(errh.response.status_code, "Erro http")
+
+        except requests.exceptions.ConnectionError as errc:
+            logger.error("Erro Conexão: %s", errc, extra=_log_fields(func, errc))
+            return _build_response(_error_status(errc, 503), "Erro Conexão")
+
+        except requests.exceptions.Timeout as errt:
+            logger.error("Erro Timeout: %s", errt, extra=_log_fields(func, errt))
+            return _build_response(_error_status(errt, 504), "Erro Timeout")
+
+        except requests.exceptions.RequestException as err:
+            logger.error("Erro Inesperado: %s", err, extra=_log_fields(func, err))
+            return _build_response(_error_status(err, 502), "Erro inesperado")
+    return wrapper
+
+
+def _error_status(error: requests.exceptions.RequestException, default: int) -> int:
+    # Falhas de conexão e timeout não têm resposta; a leitura em massa precisa
+    # de um resultado por item em vez de derrubar a requisição inteira
+    return getattr(error.response, "status_code", None) or default
+
+
+def _log_fields(func, error: requests.exceptions.RequestException) -> dict:
+    return {"operation": func.__name__, "status_code": getattr(error.response, "status_code", None)}
+
+
+def _build_response(status_code: int, body_message: str) -> dict:
+    return {
+        "statusCode": status_code,
+        "message": body_message
+    }
+
+
+@_handle_http_errors
+def _get_token(client_id: str, client_secret: str, account_id: str) -> dict:
+    if not client_id or client_id.isspace():
+        return _build_response(400, "client_id não pode ser nulo ou vazio")
+
+    if not client_secret or client_secret.isspace():
+        return _build_response(400, "client_secret não pode ser nulo ou vazio")
+
+    if not account_id or account_id.isspace():
+        return _build_response(400, "account_id não pode ser nulo ou vazio")
+
+    body = {
+        "grant_type": "client_credentials",
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "account_id": account_id
+    }
+
+    response = HEDGER.request("POST", f"{BASE_URL}/token", "token", data=body,
+                              headers={"Content-Type": "application/json"})
+    response.raise_for_status()
+    return response.json()
+
+
+
+@_handle_http_errors
+def _get_object(resource: dict, token: str) -> dict:
+    if not resource:
+        return _build_response(400, "Código do recurso não pode ser nulo")
+
+    if not isinstance(resource, dict):
+        return _build_response(400, "Tipo inválido. Deve ser um dicionário")
+
+    if "id" not in resource or not resource.get("id"):
+        return _build_response(400, "Código do recurso é obrigatório para consulta")
+
+    resource_id = resource.get("id")
+    record = _fetch_record(resource_id, token)
+    response = _build_response(200, f"Registro {resource_id} consultado com sucesso")
+    response["record"] = record
+    return response
+
+
+def _get_objects(resource: dict, token: str) -> dict:
+    resource_ids = resource.get("ids")
+    if not isinstance(resource_ids, list) or not resource_ids:
+        return _build_response(400, "Lista de códigos dos recursos não pode ser vazia")
+
+    # Ids repetidos são consultados uma vez só; a chave é a mesma do cache de registros
+    unique_ids = {}
+    for resource_id in resource_ids:
+        unique_ids.setdefault(str(resource_id), resource_id)
+    unique_ids = list(unique_ids.values())
+
+    if len(unique_ids) == 1:
+        results = [_get_object({"id": unique_ids[0]}, token)]
+    else:
+        # As consultas compartilham o pool de conexões da SESSION; acertos no cache retornam sem rede
+        with ThreadPoolExecutor(max_workers=min(GET_BULK_WORKERS, len(unique_ids)),
+                                thread_name_prefix="get-bulk") as executor:
+            results = list(executor.map(lambda resource_id: _get_object({"id": resource_id}, token), unique_ids))
+    found = sum(1 for result in results if result["statusCode"] == 200)
+    response = _build_response(200, f"{found} de {len(results)} registros consultados com sucesso")
+    response["records"] = results
+    return response
+
+
+def _fetch_record(resource_id, token: str):
+    entry = RECORD_CACHE.lookup(resource_id)
+    if entry is not None and entry.fresh:
+        return entry.body
+
+    request_header = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+    if entry is not None:
+        request_header["If-None-Match"] = entry.etag
+
+    response = SESSION.get(f"{BASE_URL}/{resource_id}", headers=request_header)
+    if response.status_code == 304 and entry is not None:
+        RECORD_CACHE.revalidate(resource_id)
+        return entry.body
+
+    if response.status_code == 404:
+        RECORD_CACHE.invalidate(resource_id)
+    response.raise_for_status()
+
+    record = response.json()
+    RECORD_CACHE.put(resource_id, record, response.headers.get("ETag"))
+    return record
+
+
+
+@profile_invocation
+def lambda_function(event, context):
+    try:
+        token = TOKEN_CACHE.get((CLIENT_ID, ACCOUNT_ID), lambda: _get_token(CLIENT_ID, SECRET_ID, ACCOUNT_ID))
+        if not token:
+            raise ValueError("O token não pode ser nulo ou vazio")
+
+        if isinstance(event, dict) and "ids" in event:
+            get_result = _get_objects(event, token["access_token"])
+        else:
+            get_result = _get_object(event, token["access_token"])
+        if not get_result:
+            raise ValueError("Houve um problema no envio da requisição")
+
+        get_result["cache"] = RECORD_CACHE.stats()
+        return get_result
+
+    except ValueError as errv:
+        logger.error("Erro de validação: %s", errv, extra={"operation": "lambda_function"})
+        return _build_response(400, str(errv))
+
+    except Exception as err:
+        logger.error("Erro ao tentar realizar a requisição: %s", err, extra={"operation": "lambda_function"})
+        return _build_response(500, "Ocorreu um erro genérico na requisição")
+
+
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_POOL_SIZE = int(os.environ.get("LAMBDA_HTTP_POOL_SIZE", "32"))
+TOKEN_CACHE_ENABLED = os.environ.get("LAMBDA_TOKEN_CACHE", "").lower() in ("1", "true", "yes")
+TOKEN_EXPIRY_MARGIN = 30
+HEDGE_ENABLED = os.environ.get("LAMBDA_HEDGE", "").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.environ.get("LAMBDA_HEDGE_PERCENTILE", "95"))
+HEDGE_MAX_RATIO = float(os.environ.get("LAMBDA_HEDGE_MAX_RATIO", "0.05"))
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 500
+HEDGE_WORKERS = int(os.environ.get("LAMBDA_HEDGE_WORKERS", "32"))
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class TokenCache:
+    def __init__(self, enabled: bool = TOKEN_CACHE_ENABLED, expiry_margin: float = TOKEN_EXPIRY_MARGIN):
+        self.enabled = enabled
+        self.expiry_margin = expiry_margin
+        self._lock = threading.Lock()
+        self._tokens = {}
+
+    def get(self, key: tuple, fetch: Callable[[], Optional[dict]]) -> Optional[dict]:
+        if not self.enabled:
+            return fetch()
+
+        # Um único fetch por vez evita que várias threads peçam token ao mesmo tempo
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+            token = fetch()
+            if isinstance(token, dict) and token.get("access_token"):
+                expires_in = float(token.get("expires_in") or 0)
+                if expires_in > self.expiry_margin:
+                    self._tokens[key] = (time.monotonic() + expires_in - self.expiry_margin, token)
+            return token
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+class RequestHedger:
+    def __init__(self, session: requests.Session, enabled: bool = HEDGE_ENABLED,
+                 percentile: float = HEDGE_PERCENTILE, max_ratio: float = HEDGE_MAX_RATIO):
+        self.session = session
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._executor = None
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+            return self._executor
+
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        with self._lock:
+            latencies = sorted(self._latencies.get(operation, ()))
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return latencies[index]
+
+    def _timed_request(self, method: str, url: str, operation: str, kwargs: dict) -> requests.Response:
+        start = time.monotonic()
+        response = self.session.request(method, url, **kwargs)
+        with self._lock:
+            self._latencies.setdefault(operation, deque(maxlen=HEDGE_WINDOW)).append(time.monotonic() - start)
+        return response
+
+    def _reserve_hedge(self) -> bool:
+        # Limita a carga extra: no máximo max_ratio das requisições geram uma segunda tentativa
+        with self._lock:
+            if self.hedged + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def request(self, method: str, url: str, operation: str, **kwargs) -> requests.Response:
+        if not self.enabled:
+            return self.session.request(method, url, **kwargs)
+
+        with self._lock:
+            self.requests += 1
+        delay = self.hedge_delay(operation)
+        executor = self._get_executor()
+        primary = executor.submit(self._timed_request, method, url, operation, kwargs)
+        if delay is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_hedge():
+            return primary.result()
+
+        hedge = executor.submit(self._timed_request, method, url, operation, kwargs)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        first = primary if primary in done else hedge
+        other = hedge if first is primary else primary
+        if _succeeded(first):
+            winner, loser = first, other
+        else:
+            # A primeira resposta foi erro; a outra tentativa pode ter tido sucesso
+            # (ex.: o DELETE lento já removeu o registro e o hedge recebeu 404)
+            wait([other])
+            if _succeeded(other) or first.exception() is not None:
+                winner, loser = other, first
+            else:
+                winner, loser = first, other
+
+        if not loser.cancel():
+            loser.add_done_callback(_close_response)
+        if winner is hedge and _succeeded(winner):
+            with self._lock:
+                self.hedge_wins += 1
+        return winner.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedgeRate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+                "hedgeWins": self.hedge_wins,
+                "winRate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0
+            }
+
+
+def _succeeded(future) -> bool:
+    return future.exception() is None and 200 <= future.result().status_code < 300
+
+
+def _close_response(future) -> None:
+    # Não dá para abortar uma chamada em andamento; a resposta perdedora só é descartada
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+SESSION = _create_session()
+TOKEN_CACHE = TokenCache()
+HEDGER = RequestHedger(SESSION)
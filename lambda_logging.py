@@ -0,0 +1,203 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.environ.get("LAMBDA_LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_WINDOW = float(os.environ.get("LAMBDA_LOG_SAMPLE_WINDOW", "10"))
+LOG_QUEUE_SIZE = int(os.environ.get("LAMBDA_LOG_QUEUE_SIZE", "10000"))
+LOG_ASYNC = os.environ.get("LAMBDA_LOG_ASYNC", "").lower() in ("1", "true", "yes")
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+STRUCTURED_FIELDS = ("operation", "status_code", "repeated")
+
+_setup_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+_logger_names = set()
+
+
+class StderrHandler(logging.StreamHandler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        # Resolve o stderr a cada escrita para acompanhar redirecionamentos
+        return sys.stderr
+
+
+def _append_fields(record: logging.LogRecord) -> None:
+    # Os campos entram na própria mensagem para aparecerem com qualquer
+    # formatter, inclusive o do handler do runtime do Lambda
+    fields = [f"{field}={getattr(record, field)}" for field in STRUCTURED_FIELDS
+              if getattr(record, field, None) is not None]
+    if not fields:
+        return
+    suffix = f" {' '.join(fields)}"
+    if record.args:
+        suffix = suffix.replace("%", "%%")
+    record.msg = f"{record.msg}{suffix}"
+
+
+class RepeatedErrorFilter(logging.Filter):
+    def __init__(self, window: float = LOG_SAMPLE_WINDOW):
+        super().__init__()
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def _key(self, record: logging.LogRecord) -> tuple:
+        # A chave usa o template da mensagem (ainda não formatada), então
+        # "Erro Conexão: %s" agrupa todas as falhas de conexão da mesma operação
+        return (record.name, record.levelno, record.msg,
+                getattr(record, "operation", None), getattr(record, "status_code", None))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            _append_fields(record)
+            return True
+
+        key = self._key(record)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window:
+                # Guarda uma cópia sem os campos para montar o resumo no flush
+                self._windows[key] = [now, 0, logging.makeLogRecord(record.__dict__)]
+                if window is not None and window[1]:
+                    record.repeated = window[1]
+            else:
+                window[1] += 1
+                return False
+
+        _append_fields(record)
+        return True
+
+    def flush(self) -> list:
+        with self._lock:
+            pending = [(record, count) for _, count, record in self._windows.values() if count]
+            self._windows.clear()
+
+        summaries = []
+        for record, count in pending:
+            summary = logging.makeLogRecord(record.__dict__)
+            summary.repeated = count
+            _append_fields(summary)
+            summaries.append(summary)
+        return summaries
+
+
+_sample_filter = RepeatedErrorFilter()
+
+
+class DeferredQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatação acontece na thread do listener, fora do caminho da requisição
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _setup() -> DeferredQueueHandler:
+    global _queue_handler, _listener
+    with _setup_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        stream_handler = StderrHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        _queue_handler = DeferredQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        _listener = QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        return _queue_handler
+
+
+def _restart_after_fork() -> None:
+    global _setup_lock, _listener
+    _setup_lock = threading.Lock()
+    if _listener is None:
+        return
+
+    # A thread do listener não sobrevive ao fork; o processo filho ganha fila e listener próprios
+    _queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def _attach_queue_handler(logger: logging.Logger, handler: DeferredQueueHandler) -> None:
+    if handler in logger.handlers:
+        return
+    for stale in [h for h in logger.handlers if isinstance(h, DeferredQueueHandler)]:
+        logger.removeHandler(stale)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    if _sample_filter not in logger.filters:
+        logger.addFilter(_sample_filter)
+        logger.setLevel(LOG_LEVEL)
+        _logger_names.add(name)
+
+    if LOG_ASYNC or _queue_handler is not None:
+        _attach_queue_handler(logger, _setup())
+    return logger
+
+
+def enable_async_logging() -> None:
+    # Só para processos de longa duração: no Lambda o ambiente é congelado logo
+    # após o retorno do handler e a fila poderia ficar para trás. Lá os registros
+    # propagam para o handler do runtime, que inclui o request id.
+    handler = _setup()
+    for name in list(_logger_names):
+        _attach_queue_handler(logging.getLogger(name), handler)
+
+
+def _emit_pending_summaries() -> None:
+    # callHandlers evita que o próprio filtro de amostragem descarte o resumo
+    for summary in _sample_filter.flush():
+        logging.getLogger(summary.name).callHandlers(summary)
+
+
+def flush_logs() -> None:
+    if _listener is None:
+        return
+    _queue_handler.queue.join()
+
+
+def shutdown_logging() -> None:
+    global _queue_handler, _listener
+    with _setup_lock:
+        _emit_pending_summaries()
+        if _listener is None:
+            return
+        flush_logs()
+        _listener.stop()
+        for name in _logger_names:
+            logger = logging.getLogger(name)
+            logger.removeHandler(_queue_handler)
+            logger.propagate = True
+        if _queue_handler.dropped:
+            sys.stderr.write(f"lambda_logging: {_queue_handler.dropped} registros descartados (fila cheia)\n")
+        _listener = None
+        _queue_handler = None
+
+
+atexit.register(shutdown_logging)
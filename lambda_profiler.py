@@ -0,0 +1,142 @@
+import cProfile
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from functools import wraps
+
+PROFILE_ENABLED = os.environ.get("LAMBDA_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.environ.get("LAMBDA_PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_DIR = os.environ.get("LAMBDA_PROFILE_DIR", "/tmp/lambda_profiles")
+PROFILE_EVENT_FLAG = "_profile"
+PROFILE_TOP_ALLOCATIONS = 25
+PROFILE_TRACEBACK_FRAMES = 16
+
+_profile_lock = threading.Lock()
+
+
+def profile_invocation(func):
+    @wraps(func)
+    def wrapper(event, context):
+        event, requested = _pop_profile_flag(event)
+        if not (requested or _should_profile()):
+            return func(event, context)
+        return _run_profiled(func, event, context)
+    return wrapper
+
+
+def _should_profile() -> bool:
+    if PROFILE_ENABLED:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _pop_profile_flag(event):
+    if not isinstance(event, dict) or PROFILE_EVENT_FLAG not in event:
+        return event, False
+
+    # O flag não deve ser repassado para o backend junto com o evento
+    event = dict(event)
+    return event, bool(event.pop(PROFILE_EVENT_FLAG))
+
+
+def _run_profiled(func, event, context):
+    # cProfile e tracemalloc são globais no processo: só uma invocação é
+    # perfilada por vez e as que se sobrepõem rodam sem profiling
+    if not _profile_lock.acquire(blocking=False):
+        return func(event, context)
+
+    try:
+        tracing_started = not tracemalloc.is_tracing()
+        if tracing_started:
+            tracemalloc.start(PROFILE_TRACEBACK_FRAMES)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # Já existe outro profiler ativo no processo; segue sem profiling
+            logging.warning("Profiling da invocação ignorado: %s", err)
+            if tracing_started:
+                tracemalloc.stop()
+            return func(event, context)
+
+        try:
+            return func(event, context)
+        finally:
+            profiler.disable()
+            _save_profile(func.__module__, context, profiler, tracing_started)
+    finally:
+        _profile_lock.release()
+
+
+def _save_profile(module_name: str, context, profiler: cProfile.Profile, tracing_started: bool) -> None:
+    # Falhas ao gravar o profiling nunca substituem o resultado do handler
+    try:
+        _write_profile(module_name, context, profiler, tracemalloc.take_snapshot())
+    except Exception as err:
+        logging.error("Erro ao gravar o profiling da invocação: %s", err)
+    finally:
+        if tracing_started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def _write_profile(module_name: str, context, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    request_id = getattr(context, "aws_request_id", None) or f"{int(time.time() * 1000)}-{os.getpid()}"
+    prefix = os.path.join(PROFILE_DIR, f"{module_name}-{request_id}")
+
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(f"{prefix}.prof")
+    with open(f"{prefix}.folded", "w", encoding="utf-8") as folded:
+        folded.writelines(f"{line}\n" for line in _collapse_stacks(stats))
+    with open(f"{prefix}.alloc.folded", "w", encoding="utf-8") as allocations:
+        allocations.writelines(f"{line}\n" for line in _collapse_allocations(snapshot))
+
+    logging.info("Profiling da invocação gravado em %s.*", prefix)
+    return prefix
+
+
+def _frame_name(func_key: tuple) -> str:
+    filename, line, name = func_key
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _collapse_stacks(stats: pstats.Stats) -> list:
+    # O cProfile só guarda arestas caller -> callee; a pilha de cada função é
+    # reconstruída seguindo o caller de maior tempo acumulado até a raiz.
+    entries = stats.stats
+    lines = []
+    for func_key, (_, _, tottime, _, callers) in entries.items():
+        micros = int(tottime * 1_000_000)
+        if micros <= 0:
+            continue
+
+        stack = [func_key]
+        seen = {func_key}
+        current = callers
+        while current:
+            parent = max(current, key=lambda caller: current[caller][3])
+            if parent in seen or parent not in entries:
+                break
+            stack.append(parent)
+            seen.add(parent)
+            current = entries[parent][4]
+
+        lines.append(f"{';'.join(_frame_name(key) for key in reversed(stack))} {micros}")
+    return lines
+
+
+def _collapse_allocations(snapshot: tracemalloc.Snapshot) -> list:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    lines = []
+    for stat in snapshot.statistics("traceback")[:PROFILE_TOP_ALLOCATIONS]:
+        frames = [f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in stat.traceback]
+        lines.append(f"{';'.join(frames)} {stat.size}")
+    return lines
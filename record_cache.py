@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+CACHE_MAX_ENTRIES = int(os.environ.get("RECORD_CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL = float(os.environ.get("RECORD_CACHE_TTL", "30"))
+
+
+class CacheEntry(NamedTuple):
+    body: Any
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class RecordCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def lookup(self, key) -> Optional[CacheEntry]:
+        key = str(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if entry.fresh:
+                self.hits += 1
+            elif not entry.etag:
+                # Sem ETag não há como revalidar, a entrada expirada é descartada
+                del self._entries[key]
+                self.misses += 1
+                return None
+            else:
+                self.stale += 1
+            return entry
+
+    def put(self, key, body: Any, etag: Optional[str] = None) -> None:
+        key = str(key)
+        with self._lock:
+            self._entries[key] = CacheEntry(body, etag, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revalidate(self, key) -> Optional[CacheEntry]:
+        key = str(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry = entry._replace(expires_at=time.monotonic() + self.ttl)
+            self._entries[key] = entry
+            self.revalidations += 1
+            return entry
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(str(key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.stale = self.revalidations = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale": self.stale,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "hitRate": round((self.hits + self.revalidations) / lookups, 4) if lookups else 0.0
+            }
+
+
+RECORD_CACHE = RecordCache()
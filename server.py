@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import BaseWSGIServer
+
+import lambda_function
+import lambda_function_content
+import lambda_function_del
+import lambda_function_get
+from lambda_http import HEDGER, TOKEN_CACHE
+from lambda_logging import enable_async_logging, get_logger, shutdown_logging
+
+SERVER_HOST = os.environ.get("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.environ.get("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "16"))
+SERVER_MODE = os.environ.get("SERVER_MODE", "thread")
+SERVER_PROCESSES = int(os.environ.get("SERVER_PROCESSES", "0")) or os.cpu_count() or 1
+SERVER_DRAIN_TIMEOUT = float(os.environ.get("SERVER_DRAIN_TIMEOUT", "25"))
+SERVER_QUEUE_SIZE = int(os.environ.get("SERVER_QUEUE_SIZE", "64"))
+PROBE_ENDPOINTS = ("health", "ready")
+
+logger = get_logger(__name__)
+
+
+class ServerContext:
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.aws_request_id = str(uuid.uuid4())
+
+
+class ServerState:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self.in_flight = 0
+        self.draining = False
+
+    def __enter__(self):
+        with self._lock:
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.in_flight -= 1
+            if not self.in_flight:
+                self._idle.notify_all()
+
+    def drain(self, timeout: float) -> bool:
+        with self._lock:
+            self.draining = True
+            return self._idle.wait_for(lambda: not self.in_flight, timeout)
+
+
+def _invoke(handler, event):
+    result = handler.lambda_function(event, ServerContext(handler.__name__))
+    return jsonify(result), result.get("statusCode") or 500
+
+
+def create_app(state: ServerState = None) -> Flask:
+    state = state or ServerState()
+    app = Flask(__name__)
+    app.config["SERVER_STATE"] = state
+
+    @app.before_request
+    def reject_while_draining():
+        # Durante a drenagem só as requisições já em andamento terminam; trabalho novo recebe 503
+        if state.draining and request.endpoint not in PROBE_ENDPOINTS:
+            return jsonify({"statusCode": 503, "message": "Servidor em desligamento"}), 503
+
+    @app.post("/objects")
+    def send_object():
+        with state:
+            event = request.get_json(silent=True)
+            if event is None:
+                event = request.get_data(as_text=True)
+            return _invoke(lambda_function, event)
+
+    @app.post("/content")
+    def send_content():
+        with state:
+            event = request.get_json(silent=True)
+            if event is None:
+                event = request.get_data(as_text=True)
+            return _invoke(lambda_function_content, event)
+
+    @app.get("/objects/<resource_id>")
+    def get_object(resource_id):
+        with state:
+            return _invoke(lambda_function_get, {"id": resource_id})
+
+    @app.delete("/objects/<resource_id>")
+    def delete_object(resource_id):
+        with state:
+            return _invoke(lambda_function_del, {"id": resource_id})
+
+    @app.get("/health")
+    def health():
+        return jsonify({"status": "ok", "inFlight": state.in_flight, "hedging": HEDGER.stats()}), 200
+
+    @app.get("/ready")
+    def ready():
+        if state.draining:
+            return jsonify({"status": "draining", "inFlight": state.in_flight}), 503
+        return jsonify({"status": "ready", "inFlight": state.in_flight}), 200
+
+    return app
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, workers: int, fd: int = None, queue_size: int = SERVER_QUEUE_SIZE):
+        super().__init__(host, port, app, fd=fd)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="server-worker")
+        # Limita as conexões aceitas (em execução + na fila); acima disso a conexão recebe 503
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.drain_expired = False
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self._reject_request(request)
+            return
+        self.executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def _reject_request(self, request):
+        body = json.dumps({"statusCode": 503, "message": "Servidor sobrecarregado"}).encode("utf-8")
+        try:
+            request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\n"
+                            b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body))
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            # Depois do prazo de drenagem a fila é descartada e as requisições restantes não são aguardadas
+            self.executor.shutdown(wait=not self.drain_expired, cancel_futures=self.drain_expired)
+
+
+def _serve(server: PooledWSGIServer, state: ServerState, drain_timeout: float) -> bool:
+    def stop(signum, frame):
+        # shutdown() espera o loop do serve_forever, então roda fora da thread principal
+        threading.Thread(target=_drain_and_stop, args=(server, state, drain_timeout), daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    server.serve_forever()
+    return not server.drain_expired
+
+
+def _drain_and_stop(server: PooledWSGIServer, state: ServerState, drain_timeout: float) -> None:
+    logger.info("Drenando %s requisições em andamento", state.in_flight)
+    if not state.drain(drain_timeout):
+        logger.warning("Tempo de drenagem esgotado com %s requisições em andamento", state.in_flight)
+        server.drain_expired = True
+    server.shutdown()
+
+
+def _run_processes(host: str, port: int, workers: int, processes: int, drain_timeout: float) -> None:
+    # Cada filho tem seus próprios TOKEN_CACHE, SESSION e HEDGER: o compartilhamento vale só dentro do processo
+    listener = socket.create_server((host, port), reuse_port=False, backlog=1024)
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            state = ServerState()
+            server = PooledWSGIServer(host, port, create_app(state), workers, fd=listener.fileno())
+            drained = _serve(server, state, drain_timeout)
+            shutdown_logging()
+            os._exit(0 if drained else 1)
+        children.append(pid)
+
+    listener.close()
+
+    def forward(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for pid in children:
+        os.waitpid(pid, 0)
+
+
+def run(host: str = SERVER_HOST, port: int = SERVER_PORT, workers: int = SERVER_WORKERS, mode: str = SERVER_MODE,
+        processes: int = SERVER_PROCESSES, drain_timeout: float = SERVER_DRAIN_TIMEOUT) -> None:
+    # No modo servidor o token é compartilhado entre as requisições do mesmo processo
+    TOKEN_CACHE.enabled = True
+    get_logger("werkzeug")
+    enable_async_logging()
+    logger.info("Servidor em %s:%s (modo %s, %s workers)", host, port, mode, workers)
+    if mode == "process":
+        _run_processes(host, port, workers, processes, drain_timeout)
+        return
+
+    state = ServerState()
+    if not _serve(PooledWSGIServer(host, port, create_app(state), workers), state, drain_timeout):
+        # As threads dos workers ainda ocupadas seguram a saída do interpretador; o prazo é rígido
+        shutdown_logging()
+        os._exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa os handlers como um serviço HTTP de longa duração")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="threads por processo")
+    parser.add_argument("--mode", choices=("thread", "process"), default=SERVER_MODE,
+                        help="'thread' compartilha token e pool de conexões entre todas as requisições; "
+                             "'process' usa vários processos, cada um com token, conexões e hedging próprios")
+    parser.add_argument("--processes", type=int, default=SERVER_PROCESSES, help="processos no modo 'process'")
+    parser.add_argument("--drain-timeout", type=float, default=SERVER_DRAIN_TIMEOUT)
+    args = parser.parse_args()
+    run(args.host, args.port, args.workers, args.mode, args.processes, args.drain_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import io
+import json
+
+import pytest
+import requests
+import responses
+from unittest.mock import patch
+
+from bulk_loader import BulkLoader, file_identity, iter_file_lines, iter_stream_lines, main, stream_identity
+from lambda_http import TOKEN_CACHE
+
+BASE_URL = "http://localhost:8080"
+TOKEN_MOCK_RESPONSE = {"access_token": "eyJhbGciOiJIUzI1NiIsImt", "token_type": "Bearer", "expires_in": 1079}
+RECORDS = [{"keys": {"email_officer": f"teste.{i}@mailer.com.br"}} for i in range(10)]
+
+
+@pytest.fixture
+def ndjson_file(tmp_path):
+    path = tmp_path / "records.ndjson"
+    path.write_text("".join(json.dumps(record) + "\n" for record in RECORDS), encoding="utf-8")
+    return path
+
+@pytest.fixture
+def mock_send():
+    with patch("bulk_loader.BulkLoader._send") as mock:
+        mock.return_value = {"statusCode": 202, "message": "Registro criado com sucesso"}
+        yield mock
+
+
+def test_iter_file_lines_from_offset(tmp_path):
+    path = tmp_path / "lines.ndjson"
+    path.write_bytes(b'{"a": 1}\n{"a": 2}\n{"a": 3}')
+
+    assert list(iter_file_lines(str(path))) == [(9, b'{"a": 1}'), (18, b'{"a": 2}'), (26, b'{"a": 3}')]
+    assert list(iter_file_lines(str(path), 9)) == [(18, b'{"a": 2}'), (26, b'{"a": 3}')]
+    assert list(iter_file_lines(str(path), 26)) == []
+
+
+def test_iter_stream_lines_skips_offset():
+    stream = io.BytesIO(b'{"a": 1}\n{"a": 2}\n')
+
+    assert list(iter_stream_lines(stream, 9)) == [(18, b'{"a": 2}')]
+
+
+def test_bulk_loader_sends_batches_and_checkpoints(ndjson_file, tmp_path, mock_send):
+    checkpoint = tmp_path / "records.checkpoint"
+    loader = BulkLoader(batch_size=4, concurrency=2, checkpoint_path=str(checkpoint), progress_stream=io.StringIO())
+
+    assert loader.run(iter_file_lines(str(ndjson_file)))
+
+    assert sorted(len(call.args[0]) for call in mock_send.call_args_list) == [2, 4, 4]
+    assert loader.sent == 10
+    assert json.loads(checkpoint.read_text())["offset"] == ndjson_file.stat().st_size
+
+
+def test_bulk_loader_resumes_from_checkpoint(ndjson_file, tmp_path, mock_send):
+    checkpoint = tmp_path / "records.checkpoint"
+    offset = len(json.dumps(RECORDS[0]) + "\n") * 6
+    checkpoint.write_text(json.dumps({"offset": offset, "input": file_identity(str(ndjson_file))}))
+
+    with patch.object(TOKEN_CACHE, "enabled", False):
+        exit_code = main([str(ndjson_file), "--checkpoint", str(checkpoint), "--batch-size", "100"],
+                         progress_stream=io.StringIO())
+
+    assert exit_code == 0
+    assert mock_send.call_args.args[0] == RECORDS[6:]
+    assert json.loads(checkpoint.read_text())["input"] == file_identity(str(ndjson_file))
+
+
+def test_bulk_loader_refuses_checkpoint_from_other_input(ndjson_file, tmp_path, mock_send):
+    checkpoint = tmp_path / "records.checkpoint"
+    identity = dict(file_identity(str(ndjson_file)), size=1)
+    checkpoint.write_text(json.dumps({"offset": 10, "input": identity}))
+
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(ndjson_file), "--checkpoint", str(checkpoint)], progress_stream=io.StringIO())
+
+    assert exc_info.value.code == 2
+    mock_send.assert_not_called()
+
+
+def test_bulk_loader_requires_checkpoint_for_stdin(mock_send):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["-"], progress_stream=io.StringIO())
+
+    assert exc_info.value.code == 2
+    mock_send.assert_not_called()
+
+
+def test_stream_identity_keeps_all_lines():
+    stream = io.BytesIO(b'{"a": 1}\n{"a": 2}\n')
+
+    identity, lines = stream_identity(stream)
+
+    assert identity["path"] == "-"
+    assert list(iter_stream_lines(lines)) == [(9, b'{"a": 1}'), (18, b'{"a": 2}')]
+
+
+def test_bulk_loader_records_failures(ndjson_file, tmp_path, mock_send):
+    ndjson_file.write_text(ndjson_file.read_text() + "not json\n", encoding="utf-8")
+    mock_send.return_value = {"statusCode": 400, "message": "Erro http"}
+    errors = tmp_path / "errors.ndjson"
+    loader = BulkLoader(batch_size=5, concurrency=1, errors_path=str(errors), progress_stream=io.StringIO())
+
+    assert not loader.run(iter_file_lines(str(ndjson_file)))
+
+    assert loader.failed == 10
+    assert loader.invalid == 1
+    rejected = errors.read_text().splitlines()
+    assert sorted(rejected) == sorted([json.dumps(record) for record in RECORDS] + ["not json"])
+    assert loader.offset == ndjson_file.stat().st_size
+
+
+def test_bulk_loader_retries_transient_failures(ndjson_file, mock_send):
+    mock_send.side_effect = [requests.exceptions.ConnectionError("recusada"),
+                             {"statusCode": 503, "message": "Erro http"},
+                             {"statusCode": 202, "message": "Registro criado com sucesso"}]
+    loader = BulkLoader(batch_size=100, concurrency=1, progress_stream=io.StringIO())
+
+    with patch("bulk_loader.BULK_RETRY_BACKOFF", 0):
+        assert loader.run(iter_file_lines(str(ndjson_file)))
+
+    assert mock_send.call_count == 3
+    assert loader.sent == 10
+
+
+def test_bulk_loader_stops_before_batch_that_keeps_failing(ndjson_file, tmp_path, mock_send):
+    mock_send.return_value = {"statusCode": 503, "message": "Erro http"}
+    checkpoint = tmp_path / "records.checkpoint"
+    errors = tmp_path / "errors.ndjson"
+    loader = BulkLoader(batch_size=10, concurrency=1, checkpoint_path=str(checkpoint), errors_path=str(errors),
+                        progress_stream=io.StringIO())
+
+    with patch("bulk_loader.BULK_RETRY_BACKOFF", 0), patch("bulk_loader.BULK_RETRIES", 2):
+        assert not loader.run(iter_file_lines(str(ndjson_file)))
+
+    assert mock_send.call_count == 3
+    assert json.loads(checkpoint.read_text())["offset"] == 0
+    assert not errors.exists()
+
+
+@responses.activate
+def test_bulk_loader_posts_batch_as_json(ndjson_file):
+    responses.add(responses.POST, f"{BASE_URL}/token", json=TOKEN_MOCK_RESPONSE, status=200)
+    responses.add(responses.POST, BASE_URL, status=202)
+    loader = BulkLoader(batch_size=100, concurrency=1, progress_stream=io.StringIO())
+
+    with patch.object(TOKEN_CACHE, "enabled", False), patch("lambda_function.CLIENT_ID", "id"), \
+            patch("lambda_function.SECRET_ID", "secret"), patch("lambda_function.ACCOUNT_ID", "account"):
+        assert loader.run(iter_file_lines(str(ndjson_file)))
+
+    request = responses.calls[1].request
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.body) == RECORDS
@@ -0,0 +1,118 @@
+import base64
+import gzip
+import json
+
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+import lambda_encoding
+from lambda_encoding import encode_content, encode_records, prepare_content_body, prepare_object_body
+
+RECORDS = [{"keys": {"email_officer": f"teste.{i}@mailer.com.br"}, "values": {"noma_officer": "Fulano"}}
+           for i in range(50)]
+
+
+@pytest.fixture(autouse=True)
+def small_thresholds():
+    with patch("lambda_encoding.ENCODING_POOL_WORKERS", 2), \
+            patch("lambda_encoding.ENCODING_POOL_MIN_RECORDS", 10), \
+            patch("lambda_encoding.ENCODING_POOL_MIN_BYTES", 64):
+        yield
+    lambda_encoding.shutdown_executor()
+
+
+def test_prepare_body_disabled_encodes_json_inline():
+    with patch("lambda_encoding._get_executor") as get_executor:
+        body, headers = prepare_object_body(RECORDS)
+        content_body, _ = prepare_content_body({"name": "ação", "file": "b"})
+
+    get_executor.assert_not_called()
+    assert json.loads(body) == RECORDS
+    assert headers == {}
+    assert json.loads(content_body) == {"name": "ação", "file": "b"}
+    assert prepare_object_body('{"a": 1}') == ('{"a": 1}', {})
+
+
+def test_prepare_body_enabled_keeps_strings():
+    with patch("lambda_encoding.ENCODING_POOL_ENABLED", True):
+        assert prepare_object_body('{"a": 1}') == ('{"a": 1}', {})
+
+
+@pytest.mark.parametrize("records", [RECORDS[:3], RECORDS])
+def test_encode_records_matches_json(records):
+    body, headers = encode_records(records)
+
+    assert json.loads(body) == records
+    assert headers == {}
+
+
+def test_encode_records_compressed():
+    with patch("lambda_encoding.ENCODING_COMPRESS", True):
+        body, headers = encode_records(RECORDS)
+
+    assert headers == {"Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(body)) == RECORDS
+
+
+@pytest.mark.parametrize("size", [10, 1000, 1001, 1002])
+def test_encode_content_bytes_file_is_base64(size):
+    file_data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    body, _ = encode_content({"name": "relatorio.pdf", "file": file_data})
+
+    decoded = json.loads(body)
+    assert decoded["name"] == "relatorio.pdf"
+    assert base64.b64decode(decoded["file"]) == file_data
+
+
+def test_encode_content_bytes_file_uncompressed_skips_pool():
+    file_data = bytes(range(256)) * 8
+    with patch("lambda_encoding._get_executor") as get_executor:
+        body, _ = encode_content({"name": "relatorio.pdf", "file": file_data})
+
+    get_executor.assert_not_called()
+    assert base64.b64decode(json.loads(body)["file"]) == file_data
+
+
+def test_encode_content_bytes_file_compressed_in_chunks():
+    file_data = bytes(range(256)) * 8
+    with patch("lambda_encoding.ENCODING_COMPRESS", True):
+        body, headers = encode_content({"name": "relatorio.pdf", "file": file_data})
+
+    assert headers == {"Content-Encoding": "gzip"}
+    assert base64.b64decode(json.loads(gzip.decompress(body))["file"]) == file_data
+
+
+def test_encode_content_string_file_compressed():
+    content = {"name": "relatorio", "file": "QUJD" * 1000}
+    with patch("lambda_encoding.ENCODING_COMPRESS", True):
+        body, headers = encode_content(content)
+
+    assert headers == {"Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(body)) == content
+
+
+def test_pool_unavailable_falls_back_inline():
+    with patch("lambda_encoding.ProcessPoolExecutor", side_effect=OSError("Function not implemented")), \
+            patch("lambda_encoding._executor_unavailable", False):
+        body, _ = encode_records(RECORDS)
+
+    assert json.loads(body) == RECORDS
+
+
+def test_broken_pool_falls_back_inline_and_is_replaced():
+    broken = MagicMock()
+    broken.map.side_effect = BrokenProcessPool("worker morto")
+
+    with patch("lambda_encoding._executor", broken):
+        body, _ = encode_records(RECORDS)
+        assert lambda_encoding._executor is not broken
+
+    assert json.loads(body) == RECORDS
+    broken.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+
+def test_pool_does_not_use_fork():
+    executor = lambda_encoding._get_executor()
+
+    assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
@@ -0,0 +1,177 @@
+import json
+import time
+
+import pytest
+import requests
+import responses
+from unittest.mock import patch
+
+from lambda_function_del import _delete_object
+from lambda_function_get import _get_object, _get_objects, lambda_function
+from record_cache import RECORD_CACHE
+
+BASE_URL = "http://localhost:8080"
+TOKEN_MOCK_RESPONSE = {"access_token": "eyJhbGciOiJIUzI1NiIsImt", "token_type": "Bearer", "expires_in": 1079}
+RECORD = {"id": 123, "name": "Fulano"}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    RECORD_CACHE.clear()
+    yield
+    RECORD_CACHE.clear()
+
+@pytest.fixture
+def mock_get_token():
+    with patch("lambda_function_get._get_token") as mock:
+        yield mock
+
+
+@pytest.mark.parametrize("content, token, expected_error", [
+    (None, "token", "Código do recurso não pode ser nulo"),
+    ("", "token", "Código do recurso não pode ser nulo"),
+    ("   ", "token", "Tipo inválido. Deve ser um dicionário"),
+    ({}, "token", "Código do recurso não pode ser nulo"),
+    (123, "token", "Tipo inválido. Deve ser um dicionário"),
+    ({"test":"test"}, "token", "Código do recurso é obrigatório para consulta"),
+    ({"id":""}, "token", "Código do recurso é obrigatório para consulta"),
+])
+def test_get_object_parameter_validation(content, token, expected_error):
+    result = _get_object(content, token)
+
+    assert expected_error == result["message"]
+    assert result["statusCode"] == 400
+
+
+@responses.activate
+def test_get_object_success_is_cached():
+    responses.add(responses.GET, f"{BASE_URL}/123", json=RECORD, status=200, headers={"ETag": '"v1"'})
+    token = "eyJhbGciOiJIUzI1"
+
+    first = _get_object({"id": 123}, token)
+    second = _get_object({"id": 123}, token)
+
+    assert first == {"statusCode": 200, "message": "Registro 123 consultado com sucesso", "record": RECORD}
+    assert second == first
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.headers["Authorization"] == f"Bearer {token}"
+    assert RECORD_CACHE.stats()["hits"] == 1
+
+
+@responses.activate
+def test_get_object_revalidates_with_etag():
+    responses.add(responses.GET, f"{BASE_URL}/123", json=RECORD, status=200, headers={"ETag": '"v1"'})
+    responses.add(responses.GET, f"{BASE_URL}/123", status=304)
+
+    with patch.object(RECORD_CACHE, "ttl", 0):
+        _get_object({"id": 123}, "token")
+        result = _get_object({"id": 123}, "token")
+
+    assert result["record"] == RECORD
+    assert len(responses.calls) == 2
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert RECORD_CACHE.stats()["revalidations"] == 1
+
+
+@responses.activate
+def test_get_object_not_found():
+    responses.add(responses.GET, f"{BASE_URL}/999", status=404)
+
+    result = _get_object({"id": 999}, "token")
+
+    assert result == {"statusCode": 404, "message": "Erro http"}
+    assert RECORD_CACHE.stats()["entries"] == 0
+
+
+@responses.activate
+def test_get_objects_bulk():
+    responses.add(responses.GET, f"{BASE_URL}/123", json=RECORD, status=200)
+    responses.add(responses.GET, f"{BASE_URL}/999", status=404)
+
+    result = _get_objects({"ids": [123, 999]}, "token")
+
+    assert result["statusCode"] == 200
+    assert result["message"] == "1 de 2 registros consultados com sucesso"
+    assert [record["statusCode"] for record in result["records"]] == [200, 404]
+
+
+@responses.activate
+@pytest.mark.parametrize("error, status_code, message", [
+    (requests.exceptions.ConnectionError("recusada"), 503, "Erro Conexão"),
+    (requests.exceptions.Timeout("lento"), 504, "Erro Timeout"),
+])
+def test_get_objects_bulk_with_unreachable_id(error, status_code, message):
+    responses.add(responses.GET, f"{BASE_URL}/1", json=RECORD, status=200)
+    responses.add(responses.GET, f"{BASE_URL}/2", body=error)
+
+    result = _get_objects({"ids": [1, 2]}, "token")
+
+    assert result["statusCode"] == 200
+    assert result["records"][1] == {"statusCode": status_code, "message": message}
+
+
+@responses.activate
+def test_get_objects_bulk_deduplicates_ids():
+    responses.add(responses.GET, f"{BASE_URL}/123", json=RECORD, status=200)
+    responses.add(responses.GET, f"{BASE_URL}/456", json={"id": 456}, status=200)
+
+    result = _get_objects({"ids": [123, 456, "123", 123]}, "token")
+
+    assert result["message"] == "2 de 2 registros consultados com sucesso"
+    assert [record["record"] for record in result["records"]] == [RECORD, {"id": 456}]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_objects_bulk_fetches_concurrently():
+    def slow_record(request):
+        time.sleep(0.2)
+        return 200, {}, json.dumps(RECORD)
+
+    for resource_id in range(1, 5):
+        responses.add_callback(responses.GET, f"{BASE_URL}/{resource_id}", callback=slow_record)
+
+    start = time.monotonic()
+    result = _get_objects({"ids": list(range(1, 5))}, "token")
+
+    assert time.monotonic() - start < 0.6
+    assert [record["statusCode"] for record in result["records"]] == [200] * 4
+
+
+def test_get_objects_empty_list():
+    result = _get_objects({"ids": []}, "token")
+
+    assert result["statusCode"] == 400
+
+
+@responses.activate
+def test_delete_object_invalidates_cache():
+    responses.add(responses.GET, f"{BASE_URL}/123", json=RECORD, status=200)
+    responses.add(responses.DELETE, f"{BASE_URL}/123", status=200)
+
+    _get_object({"id": 123}, "token")
+    _delete_object({"id": 123}, "token")
+    _get_object({"id": 123}, "token")
+
+    assert [call.request.method for call in responses.calls] == ["GET", "DELETE", "GET"]
+
+
+@responses.activate
+def test_lambda_function_reports_cache_stats(mock_get_token):
+    mock_get_token.return_value = TOKEN_MOCK_RESPONSE
+    responses.add(responses.GET, f"{BASE_URL}/123", json=RECORD, status=200)
+
+    lambda_function({"id": 123}, None)
+    result = lambda_function({"id": 123}, None)
+
+    assert result["statusCode"] == 200
+    assert result["cache"]["hitRate"] == 0.5
+
+
+def test_lambda_function_null_token(mock_get_token):
+    mock_get_token.return_value = None
+
+    result = lambda_function({"id": 123}, None)
+
+    assert result["statusCode"] == 400
+    assert "token não pode ser nulo" in result["message"]
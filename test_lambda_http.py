@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from lambda_http import RequestHedger, TokenCache
+
+TOKEN_MOCK_RESPONSE = {"access_token": "eyJhbGciOiJIUzI1NiIsImt", "token_type": "Bearer", "expires_in": 1079}
+
+
+class FakeSession:
+    def __init__(self, delays, statuses=None):
+        self.delays = list(delays)
+        self.statuses = statuses or {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            delay = self.delays[self.calls] if self.calls < len(self.delays) else 0
+            self.calls += 1
+            call = self.calls
+        time.sleep(delay)
+        response = MagicMock()
+        response.call = call
+        response.status_code = self.statuses.get(call, 200)
+        return response
+
+
+@pytest.fixture
+def warm_hedger():
+    def build(delays, max_ratio=1.0, statuses=None):
+        session = FakeSession([0.01] * 20 + list(delays), statuses)
+        hedger = RequestHedger(session, enabled=True, percentile=90, max_ratio=max_ratio)
+        for _ in range(20):
+            hedger.request("DELETE", "http://localhost:8080/1", "delete")
+        return hedger, session
+    return build
+
+
+def test_token_cache_disabled_always_fetches():
+    cache = TokenCache(enabled=False)
+    fetch = MagicMock(return_value=TOKEN_MOCK_RESPONSE)
+
+    cache.get(("id", "account"), fetch)
+    cache.get(("id", "account"), fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_token_cache_reuses_until_expiry():
+    cache = TokenCache(enabled=True, expiry_margin=30)
+    fetch = MagicMock(return_value=TOKEN_MOCK_RESPONSE)
+
+    with patch("lambda_http.time.monotonic", return_value=0):
+        assert cache.get(("id", "account"), fetch) == TOKEN_MOCK_RESPONSE
+        cache.get(("id", "account"), fetch)
+    assert fetch.call_count == 1
+
+    with patch("lambda_http.time.monotonic", return_value=1079 - 29):
+        cache.get(("id", "account"), fetch)
+    assert fetch.call_count == 2
+
+
+@pytest.mark.parametrize("token", [None, {"statusCode": 401, "message": "Erro http"}])
+def test_token_cache_does_not_store_errors(token):
+    cache = TokenCache(enabled=True)
+    fetch = MagicMock(return_value=token)
+
+    cache.get(("id", "account"), fetch)
+    cache.get(("id", "account"), fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_hedger_disabled_calls_session_directly():
+    session = MagicMock()
+    hedger = RequestHedger(session, enabled=False)
+
+    hedger.request("DELETE", "http://localhost:8080/1", "delete", headers={"a": "b"})
+
+    session.request.assert_called_once_with("DELETE", "http://localhost:8080/1", headers={"a": "b"})
+    assert hedger.stats()["requests"] == 0
+
+
+def test_hedger_waits_for_samples_before_hedging():
+    session = FakeSession([0.05])
+    hedger = RequestHedger(session, enabled=True)
+
+    hedger.request("DELETE", "http://localhost:8080/1", "delete")
+
+    assert session.calls == 1
+    assert hedger.hedge_delay("delete") is None
+
+
+def test_hedger_sends_second_attempt_for_slow_request(warm_hedger):
+    hedger, session = warm_hedger([0.5, 0.0])
+
+    start = time.monotonic()
+    response = hedger.request("DELETE", "http://localhost:8080/1", "delete")
+
+    assert time.monotonic() - start < 0.4
+    assert response.call == 22
+    assert hedger.stats() == {"requests": 21, "hedged": 1, "hedgeRate": 0.0476, "hedgeWins": 1, "winRate": 1.0}
+
+
+def test_hedger_prefers_success_over_faster_error(warm_hedger):
+    # O DELETE primário removeu o registro mas respondeu devagar; o hedge recebe 404
+    hedger, session = warm_hedger([0.3, 0.0], statuses={22: 404})
+
+    response = hedger.request("DELETE", "http://localhost:8080/1", "delete")
+
+    assert response.call == 21
+    assert response.status_code == 200
+    assert hedger.stats()["hedged"] == 1
+    assert hedger.stats()["hedgeWins"] == 0
+
+
+def test_hedger_returns_error_when_both_attempts_fail(warm_hedger):
+    hedger, session = warm_hedger([0.3, 0.0], statuses={21: 404, 22: 404})
+
+    response = hedger.request("DELETE", "http://localhost:8080/1", "delete")
+
+    assert response.status_code == 404
+    assert response.call == 22
+    assert hedger.stats()["hedgeWins"] == 0
+
+
+def test_hedger_respects_extra_load_cap(warm_hedger):
+    hedger, session = warm_hedger([0.05], max_ratio=0.0)
+
+    response = hedger.request("DELETE", "http://localhost:8080/1", "delete")
+
+    assert response.call == 21
+    assert session.calls == 21
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_hedger_fast_primary_is_not_hedged(warm_hedger):
+    hedger, session = warm_hedger([0.0])
+
+    hedger.request("DELETE", "http://localhost:8080/1", "delete")
+
+    assert session.calls == 21
+    assert hedger.stats()["hedged"] == 0
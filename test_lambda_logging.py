@@ -0,0 +1,141 @@
+import io
+import logging
+import queue
+
+import pytest
+from unittest.mock import patch
+
+import lambda_logging
+from lambda_logging import DeferredQueueHandler, RepeatedErrorFilter, enable_async_logging, get_logger, shutdown_logging
+
+
+def _record(msg="Erro Conexão: %s", args=("falha",), level=logging.ERROR, **extra):
+    record = logging.LogRecord("lambda_function", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def clock():
+    with patch("lambda_logging.time.monotonic") as mock:
+        mock.return_value = 100.0
+        yield mock
+
+
+def test_repeated_errors_are_sampled_per_window(clock):
+    log_filter = RepeatedErrorFilter(window=10)
+
+    assert log_filter.filter(_record(operation="_send_object"))
+    for i in range(5):
+        assert not log_filter.filter(_record(args=(f"falha {i}",), operation="_send_object"))
+
+    clock.return_value = 111.0
+    record = _record(operation="_send_object")
+    assert log_filter.filter(record)
+    assert record.repeated == 5
+
+
+def test_repeated_errors_grouped_by_operation_and_status(clock):
+    log_filter = RepeatedErrorFilter(window=10)
+
+    assert log_filter.filter(_record(operation="_send_object", status_code=500))
+    assert log_filter.filter(_record(operation="_send_object", status_code=502))
+    assert log_filter.filter(_record(operation="_get_token", status_code=500))
+    assert not log_filter.filter(_record(operation="_get_token", status_code=500))
+
+
+def test_info_records_are_not_sampled(clock):
+    log_filter = RepeatedErrorFilter(window=10)
+
+    assert all(log_filter.filter(_record(level=logging.INFO)) for _ in range(3))
+
+
+def test_flush_returns_pending_summaries(clock):
+    log_filter = RepeatedErrorFilter(window=10)
+    log_filter.filter(_record(operation="_send_object"))
+    log_filter.filter(_record(operation="_send_object"))
+    log_filter.filter(_record(operation="_send_object"))
+
+    summaries = log_filter.flush()
+
+    assert len(summaries) == 1
+    assert summaries[0].repeated == 2
+    assert log_filter.flush() == []
+
+
+def test_filter_appends_fields_to_message(clock):
+    record = _record(args=("100%",), operation="_delete_object", status_code=404)
+
+    assert RepeatedErrorFilter(window=10).filter(record)
+
+    assert record.getMessage() == "Erro Conexão: 100% operation=_delete_object status_code=404"
+
+
+def test_sync_output_includes_fields_and_repeated_count(clock):
+    logger = get_logger("test_lambda_logging.output")
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    try:
+        with patch.object(lambda_logging._sample_filter, "window", 10):
+            for i in range(5):
+                logger.error("Erro Conexão: %s", i, extra={"operation": "_send_object", "status_code": 503})
+            clock.return_value = 111.0
+            logger.error("Erro Conexão: %s", "de novo", extra={"operation": "_send_object", "status_code": 503})
+    finally:
+        logger.removeHandler(handler)
+
+    assert handler.stream.getvalue().splitlines() == [
+        "ERROR Erro Conexão: 0 operation=_send_object status_code=503",
+        "ERROR Erro Conexão: de novo operation=_send_object status_code=503 repeated=4",
+    ]
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    handler = DeferredQueueHandler(queue.Queue(1))
+    record = _record()
+
+    handler.emit(record)
+    handler.emit(_record())
+
+    assert handler.queue.get_nowait() is record
+    assert record.msg == "Erro Conexão: %s"
+    assert handler.dropped == 1
+
+
+def test_get_logger_propagates_to_runtime_handler_by_default(caplog):
+    logger = get_logger("test_lambda_logging.sync")
+
+    with patch.object(lambda_logging._sample_filter, "window", 10):
+        logger.error("Erro Timeout: %s", "primeiro", extra={"operation": "_get_token"})
+        logger.error("Erro Timeout: %s", "segundo", extra={"operation": "_get_token"})
+
+    assert logger.propagate
+    assert not any(isinstance(handler, DeferredQueueHandler) for handler in logger.handlers)
+    assert [record.getMessage() for record in caplog.records] == ["Erro Timeout: primeiro operation=_get_token"]
+    assert caplog.records[0].operation == "_get_token"
+
+
+def test_async_logging_only_when_enabled_and_restored_on_shutdown():
+    logger = get_logger("test_lambda_logging.async")
+
+    enable_async_logging()
+    try:
+        assert not logger.propagate
+        assert any(isinstance(handler, DeferredQueueHandler) for handler in logger.handlers)
+    finally:
+        shutdown_logging()
+
+    assert logger.propagate
+    assert not any(isinstance(handler, DeferredQueueHandler) for handler in logger.handlers)
+
+
+def test_shutdown_emits_pending_repeated_counts(caplog):
+    logger = get_logger("test_lambda_logging.summary")
+    lambda_logging._sample_filter.flush()
+
+    for i in range(3):
+        logger.error("Erro Conexão: %s", i, extra={"operation": "_delete_object"})
+    shutdown_logging()
+
+    assert [getattr(record, "repeated", None) for record in caplog.records] == [None, 2]
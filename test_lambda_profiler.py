@@ -0,0 +1,109 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+import lambda_profiler
+from lambda_profiler import profile_invocation
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    with patch("lambda_profiler.PROFILE_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+class FakeContext:
+    aws_request_id = "req-123"
+
+
+@profile_invocation
+def handler(event, context):
+    sorted(str(i) for i in range(2000))
+    return {"statusCode": 200, "message": "ok", "event": event}
+
+
+def test_profile_disabled_does_not_write(profile_dir):
+    result = handler({"id": 1}, FakeContext())
+
+    assert result["event"] == {"id": 1}
+    assert os.listdir(profile_dir) == []
+
+
+def test_profile_event_flag_is_removed_from_event(profile_dir):
+    event = {"id": 1, "_profile": True}
+    result = handler(event, FakeContext())
+
+    assert result["event"] == {"id": 1}
+    assert event == {"id": 1, "_profile": True}
+    assert sorted(os.listdir(profile_dir)) == [
+        f"{__name__}-req-123.alloc.folded",
+        f"{__name__}-req-123.folded",
+        f"{__name__}-req-123.prof",
+    ]
+
+
+def test_profile_enabled_by_environment(profile_dir):
+    with patch("lambda_profiler.PROFILE_ENABLED", True):
+        handler([{"id": 1}], FakeContext())
+
+    folded = (profile_dir / f"{__name__}-req-123.folded").read_text(encoding="utf-8")
+    assert folded
+    for line in folded.splitlines():
+        stack, value = line.rsplit(" ", 1)
+        assert stack
+        assert int(value) > 0
+
+
+def test_profile_sample_rate(profile_dir):
+    with patch("lambda_profiler.PROFILE_SAMPLE_RATE", 0.5), patch("lambda_profiler.random.random", return_value=0.9):
+        handler({"id": 1}, FakeContext())
+    assert os.listdir(profile_dir) == []
+
+    with patch("lambda_profiler.PROFILE_SAMPLE_RATE", 0.5), patch("lambda_profiler.random.random", return_value=0.1):
+        handler({"id": 1}, FakeContext())
+    assert len(os.listdir(profile_dir)) == 3
+
+
+def test_profile_write_error_keeps_result(profile_dir):
+    with patch("lambda_profiler._write_profile", side_effect=OSError("disco cheio")):
+        result = handler({"id": 1, "_profile": True}, FakeContext())
+
+    assert result["statusCode"] == 200
+    assert not lambda_profiler.tracemalloc.is_tracing()
+
+
+def test_profile_snapshot_error_keeps_result(profile_dir):
+    with patch("lambda_profiler.tracemalloc.take_snapshot", side_effect=RuntimeError("tracemalloc parado")):
+        result = handler({"id": 1, "_profile": True}, FakeContext())
+
+    assert result["statusCode"] == 200
+    assert not lambda_profiler.tracemalloc.is_tracing()
+
+
+def test_overlapping_profiled_invocations(profile_dir):
+    events = {name: (threading.Event(), threading.Event()) for name in ("first", "second")}
+
+    @profile_invocation
+    def blocking_handler(event, context):
+        started, release = events[event["name"]]
+        started.set()
+        release.wait(5)
+        return {"statusCode": 200, "name": event["name"]}
+
+    with patch("lambda_profiler.PROFILE_ENABLED", True), ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(blocking_handler, {"name": "first"}, FakeContext())
+        events["first"][0].wait(5)
+        second = executor.submit(blocking_handler, {"name": "second"}, FakeContext())
+        events["second"][0].wait(5)
+
+        # A primeira invocação termina antes da segunda, que não pode perder o resultado
+        events["first"][1].set()
+        assert first.result()["name"] == "first"
+        events["second"][1].set()
+        assert second.result()["name"] == "second"
+
+    assert len(os.listdir(profile_dir)) == 3
+    assert not lambda_profiler.tracemalloc.is_tracing()
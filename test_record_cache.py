@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from record_cache import RecordCache
+
+
+def test_lru_eviction():
+    cache = RecordCache(max_entries=2, ttl=30)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    cache.lookup(1)
+    cache.put(3, "c")
+
+    assert cache.lookup(2) is None
+    assert cache.lookup(1).body == "a"
+    assert cache.lookup(3).body == "c"
+
+
+def test_expired_entry_without_etag_is_dropped():
+    cache = RecordCache(ttl=30)
+    with patch("record_cache.time.monotonic", return_value=0):
+        cache.put(1, "a")
+
+    with patch("record_cache.time.monotonic", return_value=31):
+        assert cache.lookup(1) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entry_with_etag_is_kept_for_revalidation():
+    cache = RecordCache(ttl=30)
+    with patch("record_cache.time.monotonic", return_value=0):
+        cache.put(1, "a", '"v1"')
+
+    with patch("record_cache.time.monotonic", return_value=31):
+        entry = cache.lookup(1)
+        assert not entry.fresh
+        assert cache.revalidate(1).fresh
+
+
+def test_stats_hit_rate():
+    cache = RecordCache()
+    cache.lookup(1)
+    cache.put(1, "a")
+    cache.lookup(1)
+    cache.lookup("1")
+    cache.invalidate(1)
+    cache.lookup(1)
+
+    assert cache.stats() == {"entries": 0, "hits": 2, "stale": 0, "revalidations": 0, "misses": 2, "hitRate": 0.5}
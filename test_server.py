@@ -0,0 +1,124 @@
+import socket
+
+import pytest
+from flask import Flask
+from unittest.mock import MagicMock, patch
+
+from server import PooledWSGIServer, ServerState, _drain_and_stop, create_app
+
+
+@pytest.fixture
+def state():
+    return ServerState()
+
+@pytest.fixture
+def client(state):
+    return create_app(state).test_client()
+
+
+def test_post_objects_routes_to_create_handler(client):
+    with patch("lambda_function.lambda_function") as mock:
+        mock.return_value = {"statusCode": 202, "message": "Registro criado com sucesso"}
+        response = client.post("/objects", json=[{"id": 1}])
+
+    assert response.status_code == 202
+    assert response.get_json() == {"statusCode": 202, "message": "Registro criado com sucesso"}
+    assert mock.call_args.args[0] == [{"id": 1}]
+    assert mock.call_args.args[1].aws_request_id
+
+
+def test_post_objects_accepts_raw_body(client):
+    with patch("lambda_function.lambda_function") as mock:
+        mock.return_value = {"statusCode": 400, "message": "Erro http"}
+        response = client.post("/objects", data="invalid_json")
+
+    assert response.status_code == 400
+    assert mock.call_args.args[0] == "invalid_json"
+
+
+def test_post_content_routes_to_content_handler(client):
+    with patch("lambda_function_content.lambda_function") as mock:
+        mock.return_value = {"statusCode": 200, "message": "Registro criado com sucesso"}
+        response = client.post("/content", json={"name": "teste", "file": "QUJD"})
+
+    assert response.status_code == 200
+    assert mock.call_args.args[0] == {"name": "teste", "file": "QUJD"}
+
+
+def test_delete_objects_routes_to_delete_handler(client):
+    with patch("lambda_function_del.lambda_function") as mock:
+        mock.return_value = {"statusCode": 200, "message": "Registro 123 excluído com sucesso"}
+        response = client.delete("/objects/123")
+
+    assert response.status_code == 200
+    assert mock.call_args.args[0] == {"id": "123"}
+
+
+def test_get_objects_routes_to_get_handler(client):
+    with patch("lambda_function_get.lambda_function") as mock:
+        mock.return_value = {"statusCode": 200, "message": "Registro 123 consultado com sucesso"}
+        response = client.get("/objects/123")
+
+    assert response.status_code == 200
+    assert mock.call_args.args[0] == {"id": "123"}
+
+
+def test_handler_without_status_code_returns_500(client):
+    with patch("lambda_function_del.lambda_function") as mock:
+        mock.return_value = {"statusCode": None, "message": "Erro Conexão"}
+        response = client.delete("/objects/123")
+
+    assert response.status_code == 500
+
+
+def test_health_and_readiness(client, state):
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 200
+
+    assert state.drain(timeout=0)
+
+    ready = client.get("/ready")
+    assert ready.status_code == 503
+    assert client.get("/health").status_code == 200
+
+
+def test_drain_waits_for_in_flight_requests(state):
+    with state:
+        assert not state.drain(timeout=0.01)
+    assert state.drain(timeout=0.01)
+
+
+def test_draining_rejects_new_work_but_answers_probes(client, state):
+    state.draining = True
+
+    with patch("lambda_function.lambda_function") as mock:
+        response = client.post("/objects", json=[{"id": 1}])
+
+    assert response.status_code == 503
+    mock.assert_not_called()
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 503
+
+
+def test_drain_deadline_marks_server_to_drop_queue(state):
+    server = MagicMock(drain_expired=False)
+
+    with state:
+        _drain_and_stop(server, state, drain_timeout=0.01)
+
+    assert server.drain_expired
+    server.shutdown.assert_called_once()
+
+
+def test_pooled_server_sheds_load_when_queue_is_full():
+    server = PooledWSGIServer("127.0.0.1", 0, Flask(__name__), workers=1, queue_size=0)
+    client_side, server_side = socket.socketpair()
+    try:
+        assert server._slots.acquire(blocking=False)
+        server.process_request(server_side, ("127.0.0.1", 0))
+
+        assert client_side.recv(1024).startswith(b"HTTP/1.1 503 Service Unavailable")
+    finally:
+        client_side.close()
+        server.server_close()
+        server.executor.shutdown()